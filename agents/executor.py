@@ -1,32 +1,71 @@
 from __future__ import annotations
 
-import json
-from typing import List, Optional
-
-from agents.schemas import AgentPlan, ExecutionState, PlanStep, ToolResult, VerifierStep
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from agents.formatting import format_results
+from agents.schemas import (
+    AgentPlan,
+    ExecutionState,
+    PlanStep,
+    TOOL_RESULT_ADAPTER,
+    ToolResult,
+    VerifierStep,
+    deps_mask,
+    plan_levels,
+)
 from llm.groq_client import GroqClient
 from tools.registry import get_tool
+from utils.cache import canonical_args
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Compose actions that only lay tool output out as format_results does (a bulleted
+# list) are rendered locally; anything asking for judgement or a different layout,
+# unit, order or subset goes to the LLM.
+_FORMAT_ONLY_RE = re.compile(r"\b(format|bullet|list)", re.IGNORECASE)
+_REASONING_RE = re.compile(
+    r"\b(recommend|compar|explain|analy[sz]|should|suggest|decid|choos|best|why|summari[sz]|evaluat|advis|rank|insight)",
+    re.IGNORECASE,
+)
+_CONSTRAINT_RE = re.compile(
+    r"\b(table|tabul|fahrenheit|celsius|kelvin|mph|convert|translat|sort|order|top|only|first|last|group|json|csv|markdown)",
+    re.IGNORECASE,
+)
+
+
+def _dumps(obj: Any) -> str:
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
 
 class ExecutorAgent:
-    """Executor Agent: executes plan steps sequentially and calls tools."""
+    """Executor Agent: executes plan steps in dependency waves and calls tools.
+
+    Steps whose dependencies are all satisfied run concurrently on a thread
+    pool (tool calls are network-bound); results are merged back in step
+    order so logs stay deterministic.
+    """
 
-    def __init__(self, llm: Optional[GroqClient] = None) -> None:
+    def __init__(self, llm: Optional[GroqClient] = None, max_workers: int = 8) -> None:
         self.llm = llm
+        self.max_workers = max_workers
 
     def run(self, task: str, plan: AgentPlan) -> ExecutionState:
         state = ExecutionState(task=task, plan=plan)
-        self._run_steps(plan.steps, state)
+        self._run_steps(plan.levels, plan.deps_masks, state)
         return state
 
     def run_fix_steps(self, state: ExecutionState, fix_steps: List[VerifierStep]) -> ExecutionState:
         pseudo_steps: List[PlanStep] = []
         for fs in fix_steps:
+            # VerifierStep is already validated; skip re-running PlanStep validators.
             pseudo_steps.append(
-                PlanStep(
+                PlanStep.model_construct(
                     id=fs.id,
                     action=fs.action,
                     tool_name=fs.tool_name,
@@ -35,16 +74,50 @@ class ExecutorAgent:
                     depends_on=fs.depends_on,
                 )
             )
-        self._run_steps(pseudo_steps, state)
+        try:
+            levels = plan_levels(pseudo_steps)
+        except ValueError:
+            # Cyclic fix steps: run as one wave; their deps never complete, so they are skipped.
+            levels = [pseudo_steps]
+        for s in pseudo_steps:
+            state.bit_by_id.setdefault(s.id, len(state.bit_by_id))
+        masks = {s.id: deps_mask(s.depends_on, state.bit_by_id) for s in pseudo_steps}
+        self._run_steps(levels, masks, state)
         return state
 
-    def _deps_ok(self, step: PlanStep, state: ExecutionState) -> bool:
-        for dep in step.depends_on:
-            if state.step_status.get(dep) != "ok":
-                return False
-        return True
+    def _deps_ok(self, mask: int, state: ExecutionState) -> bool:
+        return (state.done_mask & mask) == mask
+
+    def _can_format_locally(self, step: PlanStep) -> bool:
+        if os.getenv("AI_OPS_LOCAL_COMPOSE") == "1":
+            return True
+        action = step.action
+        return bool(_FORMAT_ONLY_RE.search(action)) and not (
+            _REASONING_RE.search(action) or _CONSTRAINT_RE.search(action)
+        )
+
+    def _compose_inputs(self, state: ExecutionState, step: PlanStep) -> Dict[str, Any]:
+        """Results the step depends on (all results if it declares none), minus tool meta."""
+        if step.depends_on:
+            keys = [state.key_by_id[d] for d in step.depends_on if state.key_by_id.get(d) in state.results]
+        else:
+            keys = list(state.results)
+
+        inputs: Dict[str, Any] = {}
+        for key in keys:
+            res = state.results[key]
+            if isinstance(res, dict) and "meta" in res:
+                res = {k: v for k, v in res.items() if k != "meta"}
+            inputs[key] = res
+        return inputs
 
     def _compose_text(self, state: ExecutionState, step: PlanStep) -> str:
+        inputs = self._compose_inputs(state, step)
+        if self._can_format_locally(step):
+            text = format_results(inputs)
+            if text is not None:
+                return text
+
         # If no LLM provided, fall back to a simple note.
         if not self.llm:
             return step.action
@@ -63,39 +136,66 @@ class ExecutorAgent:
                 "content": (
                     f"Task: {state.task}\n"
                     f"Step action: {step.action}\n\n"
-                    f"Available results JSON:\n{json.dumps(state.results, ensure_ascii=False, indent=2)}"
+                    f"Available results JSON:\n{_dumps(inputs)}"
                 ),
             },
         ]
-        resp = self.llm.chat(messages, temperature=0.2, max_tokens=500, json_mode=False)
+        resp = self.llm.chat(
+            messages,
+            temperature=0.2,
+            max_tokens=500,
+            json_mode=False,
+            cache_if=lambda text: bool(text.strip()),
+        )
         return resp.content.strip()
 
-    def _run_steps(self, steps: List[PlanStep], state: ExecutionState) -> None:
-        for step in steps:
-            if not self._deps_ok(step, state):
-                state.step_status[step.id] = "skipped"
-                state.logs.append(f"Step {step.id} skipped due to failed dependency: {step.depends_on}")
-                continue
-
-            if step.tool_name is None:
-                text = self._compose_text(state, step)
-                state.step_status[step.id] = "ok"
-                state.results[step.output_key] = {"text": text}
-                state.logs.append(f"Step {step.id} composed text under '{step.output_key}'")
-                continue
-
-            tool = get_tool(step.tool_name)
-            state.logs.append(f"Step {step.id} calling tool '{step.tool_name}' with args={step.tool_args}")
-
-            try:
-                tool_res: ToolResult = tool.call(step.tool_args)
-            except Exception as e:
-                tool_res = ToolResult(ok=False, tool_name=step.tool_name, error=str(e))
-
-            state.results[step.output_key] = tool_res.model_dump()
-            state.step_status[step.id] = "ok" if tool_res.ok else "failed"
-
-            if tool_res.ok:
-                state.logs.append(f"Step {step.id} ok -> stored '{step.output_key}'")
-            else:
-                state.logs.append(f"Step {step.id} failed: {tool_res.error}")
+    def _run_one(self, step: PlanStep, state: ExecutionState) -> Tuple[str, Any, List[str]]:
+        """Run a single step without mutating state; returns (status, result, logs)."""
+        if step.tool_name is None:
+            text = self._compose_text(state, step)
+            return "ok", {"text": text}, [f"Step {step.id} composed text under '{step.output_key}'"]
+
+        key = f"{step.tool_name}|{canonical_args(step.tool_args)}"
+        cached = state._tool_cache.get(key)
+        if cached is not None:
+            return "ok", TOOL_RESULT_ADAPTER.dump_python(cached), [
+                f"Step {step.id} reused cached '{step.tool_name}' result -> stored '{step.output_key}'"
+            ]
+
+        tool = get_tool(step.tool_name)
+        logs = [f"Step {step.id} calling tool '{step.tool_name}' with args={step.tool_args}"]
+
+        try:
+            tool_res: ToolResult = tool.call(step.tool_args)
+        except Exception as e:
+            tool_res = ToolResult(ok=False, tool_name=step.tool_name, error=str(e))
+
+        if tool_res.ok:
+            state._tool_cache[key] = tool_res
+            logs.append(f"Step {step.id} ok -> stored '{step.output_key}'")
+        else:
+            logs.append(f"Step {step.id} failed: {tool_res.error}")
+        return ("ok" if tool_res.ok else "failed"), TOOL_RESULT_ADAPTER.dump_python(tool_res), logs
+
+    def _run_steps(self, levels: List[List[PlanStep]], masks: Dict[int, int], state: ExecutionState) -> None:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for wave in levels:
+                ready: List[PlanStep] = []
+                for step in wave:
+                    if not self._deps_ok(masks[step.id], state):
+                        state.step_status[step.id] = "skipped"
+                        state.logs.append(f"Step {step.id} skipped due to failed dependency: {step.depends_on}")
+                        continue
+                    ready.append(step)
+
+                if len(ready) == 1:
+                    outcomes = [self._run_one(ready[0], state)]
+                else:
+                    outcomes = list(pool.map(lambda st: self._run_one(st, state), ready))
+
+                for step, (status, result, logs) in zip(ready, outcomes):
+                    state.results[step.output_key] = result
+                    state.step_status[step.id] = status
+                    if status == "ok":
+                        state.done_mask |= 1 << state.bit_by_id[step.id]
+                    state.logs.extend(logs)
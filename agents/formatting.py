@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _format_weather(data: Dict[str, Any]) -> List[str]:
+    place = ", ".join(p for p in (data.get("city"), data.get("country")) if p) or "requested location"
+    parts: List[str] = []
+    if data.get("conditions"):
+        parts.append(str(data["conditions"]))
+    if isinstance(data.get("temperature_c"), (int, float)):
+        parts.append(f"{data['temperature_c']:.1f}°C")
+    if isinstance(data.get("apparent_temperature_c"), (int, float)):
+        parts.append(f"feels like {data['apparent_temperature_c']:.1f}°C")
+    if data.get("humidity_pct") is not None:
+        parts.append(f"humidity {data['humidity_pct']}%")
+    if isinstance(data.get("wind_kph"), (int, float)):
+        parts.append(f"wind {data['wind_kph']:.1f} km/h")
+    return [f"- Weather in {place}: {', '.join(parts) or 'no data'}"]
+
+
+def _format_github(data: Dict[str, Any]) -> List[str]:
+    lines = [f"GitHub repositories for '{data.get('query', '')}':"]
+    for it in data.get("items") or []:
+        desc = f": {it['description']}" if it.get("description") else ""
+        lines.append(f"- {it.get('full_name') or it.get('name')} (★{it.get('stars')}){desc} — {it.get('url')}")
+    return lines
+
+
+def _format_news(data: Dict[str, Any]) -> List[str]:
+    lines = [f"News for '{data.get('query', '')}':"]
+    for a in data.get("articles") or []:
+        source = f" ({a['source']})" if a.get("source") else ""
+        lines.append(f"- {a.get('title')}{source} — {a.get('url')}")
+    return lines
+
+
+_FORMATTERS: Dict[str, Callable[[Dict[str, Any]], List[str]]] = {
+    "weather_current": _format_weather,
+    "github_repo_search": _format_github,
+    "news_search": _format_news,
+}
+
+
+def format_results(results: Dict[str, Any]) -> Optional[str]:
+    """Render executor results as plain-text bullets without an LLM.
+
+    Returns None if any result is a failed tool call or has an unknown shape,
+    so the caller can fall back to LLM composition.
+    """
+    blocks: List[str] = []
+    for value in results.values():
+        if not isinstance(value, dict):
+            return None
+        if set(value) == {"text"}:
+            blocks.append(str(value["text"]))
+            continue
+        formatter = _FORMATTERS.get(value.get("tool_name"))
+        if formatter is None or value.get("ok") is not True:
+            return None
+        blocks.append("\n".join(formatter(value.get("data") or {})))
+    if not blocks:
+        return None
+    return "\n\n".join(blocks)
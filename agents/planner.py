@@ -1,11 +1,49 @@
 from __future__ import annotations
 
 import json
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple, TypeVar
 
-from agents.schemas import AgentPlan
+from agents.schemas import AgentPlan, PlanWithSpec, VerificationSpec, parse_plan, parse_plan_with_spec
 from llm.groq_client import GroqClient, safe_json_loads
-from llm.prompts import PLANNER_SYSTEM, PLANNER_USER_TEMPLATE, TOOL_CATALOG
+from llm.prompts import (
+    PLANNER_SYSTEM,
+    PLANNER_USER_PREFIX,
+    PLANNER_VERIFIER_SYSTEM,
+    PLANNER_VERIFIER_USER_PREFIX,
+    TASK_PLACEHOLDER,
+)
+from llm.repair import build_repair_prompt
+from tools.registry import TOOL_NAMES
+
+T = TypeVar("T")
+
+
+def _check_tools(plan: AgentPlan) -> AgentPlan:
+    """Reject plans naming a tool that is not registered (feeds the repair loop)."""
+    unknown = sorted({s.tool_name for s in plan.steps if s.tool_name and s.tool_name not in TOOL_NAMES})
+    if unknown:
+        raise ValueError(f"Unknown tool(s): {unknown}. Available: {sorted(TOOL_NAMES)}")
+    return plan
+
+
+def _parse_checked_plan(data: Any) -> AgentPlan:
+    return _check_tools(parse_plan(data))
+
+
+def _parse_checked_plan_with_spec(data: Any) -> PlanWithSpec:
+    out = parse_plan_with_spec(data)
+    _check_tools(out.plan)
+    return out
+
+
+def _is_complete(text: str, validate: Callable[[Any], Any]) -> bool:
+    if not text.rstrip().endswith("}"):
+        return False
+    try:
+        validate(json.loads(text))
+    except Exception:
+        return False
+    return True
 
 
 class PlannerAgent:
@@ -15,38 +53,42 @@ class PlannerAgent:
         self.llm = llm or GroqClient()
 
     def plan(self, task: str) -> AgentPlan:
-        tool_catalog_json = json.dumps(TOOL_CATALOG, ensure_ascii=False, indent=2)
-        user_prompt = PLANNER_USER_TEMPLATE.format(
-            task=task,
-            tool_catalog_json=tool_catalog_json,
-        )
-        messages = [
-            {"role": "system", "content": PLANNER_SYSTEM},
+        user_prompt = PLANNER_USER_PREFIX.replace(TASK_PLACEHOLDER, task, 1)
+        return self._request(PLANNER_SYSTEM, user_prompt, _parse_checked_plan, max_tokens=1400)
+
+    def plan_with_spec(self, task: str) -> Tuple[AgentPlan, VerificationSpec]:
+        """Plan and emit a verification spec in one LLM call (checked locally after execution)."""
+        user_prompt = PLANNER_VERIFIER_USER_PREFIX.replace(TASK_PLACEHOLDER, task, 1)
+        out = self._request(PLANNER_VERIFIER_SYSTEM, user_prompt, _parse_checked_plan_with_spec, max_tokens=1600)
+        return out.plan, out.verification_spec
+
+    def _request(self, system: str, user_prompt: str, validate: Callable[[Any], T], max_tokens: int) -> T:
+        base_messages = [
+            {"role": "system", "content": system},
             {"role": "user", "content": user_prompt},
         ]
+        messages = base_messages
 
         last_err: Optional[str] = None
         last_text: Optional[str] = None
 
         for _attempt in range(3):
-            resp = self.llm.chat(messages, temperature=0.1, max_tokens=1400, json_mode=True)
+            # Stream and stop as soon as the text is a complete, valid document.
+            # JSON mode is not combined with streaming; the prompt already demands strict JSON.
+            resp = self.llm.chat(
+                messages,
+                temperature=0.1,
+                max_tokens=max_tokens,
+                stream=True,
+                stop_when=lambda text: _is_complete(text, validate),
+            )
             last_text = resp.content
             try:
                 data = safe_json_loads(resp.content)
-                return AgentPlan.model_validate(data)
+                return validate(data)
             except Exception as e:
                 last_err = str(e)
-                # Ask model to repair output (strict JSON only)
-                repair_user = (
-                    "Your previous output was invalid JSON or did not match the schema. "
-                    "Fix it and output ONLY valid JSON.\n"
-                    f"Error: {last_err}\n"
-                    "Previous output:\n"
-                    f"{last_text}"
-                )
-                messages = [
-                    {"role": "system", "content": PLANNER_SYSTEM},
-                    {"role": "user", "content": repair_user},
-                ]
+                # Keep the original system + task context; append only the error and offending fragments.
+                messages = [*base_messages, {"role": "user", "content": build_repair_prompt(e, last_text)}]
 
         raise RuntimeError(f"PlannerAgent failed to produce valid plan. Last error: {last_err}")
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Literal
+from typing import Any, Callable, Dict, List, Optional, Literal
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+import fastjsonschema
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, TypeAdapter, field_validator, model_validator
 
 
 ToolName = Literal["weather_current", "github_repo_search", "news_search"]
 
 class PlanStep(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=False, validate_assignment=False)
 
     id: int = Field(..., ge=1)
     action: str = Field(..., min_length=1)
@@ -25,8 +26,62 @@ class PlanStep(BaseModel):
             raise ValueError("depends_on cannot include step id itself")
         return v
 
+def step_bits(steps: List[PlanStep]) -> Dict[int, int]:
+    """Step id -> bit index by position, so mask width tracks step count, not id values."""
+    return {s.id: i for i, s in enumerate(steps)}
+
+def deps_mask(depends_on: List[int], bits: Dict[int, int]) -> int:
+    """Bitmask with each dependency's bit set.
+
+    An id missing from `bits` can never complete, so the mask is -1 (every bit set),
+    which no done_mask satisfies.
+    """
+    mask = 0
+    for dep in depends_on:
+        bit = bits.get(dep)
+        if bit is None:
+            return -1
+        mask |= 1 << bit
+    return mask
+
+def plan_levels(steps: List[PlanStep]) -> List[List[PlanStep]]:
+    """Group steps into dependency waves: level = 1 + max(level of in-batch deps).
+
+    Compose steps (tool_name=None) additionally wait for every step listed before
+    them, so a compose_final without explicit depends_on still runs last.
+    Deps outside `steps` (e.g. plan steps referenced by fix steps) are treated as resolved.
+    Raises ValueError on dependency cycles.
+    """
+    by_id = {s.id: s for s in steps}
+    position = {s.id: i for i, s in enumerate(steps)}
+    levels: Dict[int, int] = {}
+    visiting: set = set()
+
+    def level_of(step: PlanStep) -> int:
+        if step.id in levels:
+            return levels[step.id]
+        if step.id in visiting:
+            raise ValueError(f"depends_on has a cycle through step {step.id}")
+        visiting.add(step.id)
+        lvl = 0
+        for dep in step.depends_on:
+            if dep in by_id:
+                lvl = max(lvl, level_of(by_id[dep]) + 1)
+        if step.tool_name is None:
+            for prev in steps[: position[step.id]]:
+                if prev.id in levels:
+                    lvl = max(lvl, levels[prev.id] + 1)
+        visiting.discard(step.id)
+        levels[step.id] = lvl
+        return lvl
+
+    waves: Dict[int, List[PlanStep]] = {}
+    for step in steps:
+        waves.setdefault(level_of(step), []).append(step)
+    return [waves[k] for k in sorted(waves)]
+
 class AgentPlan(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=False, validate_assignment=False)
 
     objective: str = Field(..., min_length=1)
     assumptions: List[str] = Field(default_factory=list)
@@ -43,8 +98,43 @@ class AgentPlan(BaseModel):
             raise ValueError("Last step must be compose_final (tool_name=null, output_key='final')")
         return steps
 
+    # Execution schedule, computed once at validation time.
+    _levels: List[List[PlanStep]] = PrivateAttr(default_factory=list)
+    _deps_mask: Dict[int, int] = PrivateAttr(default_factory=dict)
+    _step_bits: Dict[int, int] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="after")
+    def build_schedule(self) -> "AgentPlan":
+        self._levels = plan_levels(self.steps)
+        self._step_bits = step_bits(self.steps)
+        self._deps_mask = {s.id: deps_mask(s.depends_on, self._step_bits) for s in self.steps}
+        return self
+
+    @property
+    def levels(self) -> List[List[PlanStep]]:
+        return self._levels
+
+    @property
+    def deps_masks(self) -> Dict[int, int]:
+        return self._deps_mask
+
+    @property
+    def step_bits(self) -> Dict[int, int]:
+        return self._step_bits
+
+class VerificationSpec(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=False, validate_assignment=False)
+
+    required_keys: List[str] = Field(default_factory=list)  # output_keys that must exist with ok=true
+
+class PlanWithSpec(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=False, validate_assignment=False)
+
+    plan: AgentPlan
+    verification_spec: VerificationSpec = Field(default_factory=VerificationSpec)
+
 class ToolResult(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=False, validate_assignment=False)
 
     ok: bool
     tool_name: ToolName
@@ -52,17 +142,30 @@ class ToolResult(BaseModel):
     error: Optional[str] = None
     meta: Dict[str, Any] = Field(default_factory=dict)
 
-class ExecutionState(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+class ExecutionState:
+    """Mutable executor state.
 
-    task: str
-    plan: AgentPlan
-    results: Dict[str, Any] = Field(default_factory=dict)  # output_key -> tool result / notes
-    step_status: Dict[int, str] = Field(default_factory=dict)  # id -> ok/failed/skipped
-    logs: List[str] = Field(default_factory=list)
+    A plain slotted class rather than a pydantic model: it is written on every
+    step and never validated, and results/logs are already plain dict/list at
+    the API boundary. (dataclass(slots=True) would need Python 3.10.)
+    """
+
+    __slots__ = ("task", "plan", "results", "step_status", "logs", "done_mask", "bit_by_id", "key_by_id", "_tool_cache")
+
+    def __init__(self, task: str, plan: AgentPlan) -> None:
+        self.task = task
+        self.plan = plan
+        self.results: Dict[str, Any] = {}  # output_key -> tool result / notes
+        self.step_status: Dict[int, str] = {}  # id -> ok/failed/skipped
+        self.logs: List[str] = []
+        self.done_mask = 0  # bit bit_by_id[id] set once step `id` is ok; see deps_mask()
+        self.bit_by_id: Dict[int, int] = dict(plan.step_bits)  # extended for each fix-step batch
+        self.key_by_id: Dict[int, str] = {s.id: s.output_key for s in plan.steps}  # step id -> output_key
+        # tool_name|sorted-args JSON -> successful ToolResult, so repeated calls (e.g. fix rounds) are free
+        self._tool_cache: Dict[str, ToolResult] = {}
 
 class VerifierStep(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=False, validate_assignment=False)
 
     id: int = Field(..., ge=1000)
     action: str
@@ -72,9 +175,41 @@ class VerifierStep(BaseModel):
     depends_on: List[int] = Field(default_factory=list)
 
 class VerificationResult(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=False, validate_assignment=False)
 
     status: Literal["complete", "needs_fix"]
     issues: List[str] = Field(default_factory=list)
     fix_steps: List[VerifierStep] = Field(default_factory=list)
     final_output: Dict[str, Any] = Field(default_factory=dict)
+
+
+# Structural validators compiled once from the pydantic schemas. Output that passes
+# them only needs pydantic's semantic validators; output that fails falls through
+# to pydantic, which coerces or reports it.
+_validate_plan = fastjsonschema.compile(AgentPlan.model_json_schema())
+_validate_plan_with_spec = fastjsonschema.compile(PlanWithSpec.model_json_schema())
+_validate_verification = fastjsonschema.compile(VerificationResult.model_json_schema())
+
+# Pre-built adapters: the core validators/serializers are resolved once at import.
+PLAN_ADAPTER = TypeAdapter(AgentPlan)
+PLAN_WITH_SPEC_ADAPTER = TypeAdapter(PlanWithSpec)
+VERIFICATION_ADAPTER = TypeAdapter(VerificationResult)
+TOOL_RESULT_ADAPTER = TypeAdapter(ToolResult)
+
+def _parse(check: Callable[[Any], Any], adapter: TypeAdapter, data: Any) -> Any:
+    try:
+        data = check(data)
+    except fastjsonschema.JsonSchemaValueException:
+        # The strict pre-pass rejects what pydantic's lax mode coerces (e.g. "id": "1");
+        # let pydantic decide rather than spend an LLM repair round on it.
+        pass
+    return adapter.validate_python(data)
+
+def parse_plan(data: Any) -> AgentPlan:
+    return _parse(_validate_plan, PLAN_ADAPTER, data)
+
+def parse_plan_with_spec(data: Any) -> PlanWithSpec:
+    return _parse(_validate_plan_with_spec, PLAN_WITH_SPEC_ADAPTER, data)
+
+def parse_verification(data: Any) -> VerificationResult:
+    return _parse(_validate_verification, VERIFICATION_ADAPTER, data)
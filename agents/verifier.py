@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-import json
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from agents.schemas import AgentPlan, VerificationResult
+import orjson
+
+from agents.schemas import AgentPlan, VerificationResult, VerificationSpec, parse_verification
 from llm.groq_client import GroqClient, safe_json_loads
 from llm.prompts import VERIFIER_SYSTEM, VERIFIER_USER_TEMPLATE
+from llm.repair import build_repair_prompt
+
+
+def _is_valid_verification(text: str) -> bool:
+    try:
+        parse_verification(safe_json_loads(text))
+    except Exception:
+        return False
+    return True
 
 
 class VerifierAgent:
@@ -14,38 +24,70 @@ class VerifierAgent:
     def __init__(self, llm: Optional[GroqClient] = None) -> None:
         self.llm = llm or GroqClient()
 
+    def check_spec(self, spec: VerificationSpec, plan: AgentPlan, results: dict) -> Optional[VerificationResult]:
+        """Evaluate the planner's verification spec locally (no LLM call).
+
+        Returns a complete VerificationResult when every required key is present
+        and ok, otherwise None so the caller can fall back to `verify`. Every tool
+        step's output is required regardless of the spec, so a failed tool call
+        always reaches the LLM verifier (and its fix steps).
+        """
+        required: List[str] = list(spec.required_keys)
+        for step in plan.steps:
+            if step.tool_name is not None and step.output_key not in required:
+                required.append(step.output_key)
+        if "final" not in required:
+            required.append("final")
+
+        for key in required:
+            res = results.get(key)
+            if not isinstance(res, dict):
+                return None
+            if "ok" in res and res["ok"] is not True:
+                return None
+
+        summary = str(results["final"].get("text") or "").strip()
+        if not summary:
+            return None
+
+        data: Dict[str, Any] = {}
+        for key, res in results.items():
+            if key != "final" and isinstance(res, dict) and res.get("ok") is True:
+                data[key] = res.get("data", {})
+
+        return VerificationResult(status="complete", final_output={"summary": summary, "data": data})
+
     def verify(self, task: str, plan: AgentPlan, results: dict) -> VerificationResult:
         user_prompt = VERIFIER_USER_TEMPLATE.format(
             task=task,
-            plan_json=json.dumps(plan.model_dump(), ensure_ascii=False, indent=2),
-            results_json=json.dumps(results, ensure_ascii=False, indent=2),
+            plan_json=plan.model_dump_json(indent=2),
+            results_json=orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode(),
         )
-        messages = [
+        base_messages = [
             {"role": "system", "content": VERIFIER_SYSTEM},
             {"role": "user", "content": user_prompt},
         ]
+        messages = base_messages
 
         last_err: Optional[str] = None
         last_text: Optional[str] = None
 
-        for _attempt in range(3):
-            resp = self.llm.chat(messages, temperature=0.1, max_tokens=1600, json_mode=True)
+        for attempt in range(3):
+            # Only the first request is cacheable, and only once it validates; repair rounds go to the model.
+            resp = self.llm.chat(
+                messages,
+                temperature=0.1,
+                max_tokens=1600,
+                json_mode=True,
+                cache_if=_is_valid_verification if attempt == 0 else None,
+            )
             last_text = resp.content
             try:
                 data = safe_json_loads(resp.content)
-                return VerificationResult.model_validate(data)
+                return parse_verification(data)
             except Exception as e:
                 last_err = str(e)
-                repair_user = (
-                    "Your previous output was invalid JSON or did not match the schema. "
-                    "Fix it and output ONLY valid JSON.\n"
-                    f"Error: {last_err}\n"
-                    "Previous output:\n"
-                    f"{last_text}"
-                )
-                messages = [
-                    {"role": "system", "content": VERIFIER_SYSTEM},
-                    {"role": "user", "content": repair_user},
-                ]
+                # Keep the original system + task context; append only the error and offending fragments.
+                messages = [*base_messages, {"role": "user", "content": build_repair_prompt(e, last_text)}]
 
         raise RuntimeError(f"VerifierAgent failed to produce valid verification JSON. Last error: {last_err}")
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+try:  # optional on-disk backend
+    import diskcache
+except ImportError:  # pragma: no cover - depends on environment
+    diskcache = None
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "ai-ops", "llm")
+DEFAULT_TTL_S = 86400
+
+
+class LLMCache:
+    """In-process LRU for deterministic LLM responses, optionally backed by diskcache."""
+
+    def __init__(self, maxsize: int = 256, directory: Optional[str] = None, ttl_s: int = DEFAULT_TTL_S) -> None:
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self.hits = 0
+        self.misses = 0
+        self._mem: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = diskcache.Cache(os.path.expanduser(directory)) if (directory and diskcache) else None
+
+    @staticmethod
+    def make_key(**parts: Any) -> str:
+        blob = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return self._mem[key]
+
+        value = self._disk.get(key) if self._disk is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._put_mem(key, value)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._put_mem(key, value)
+        if self._disk is not None:
+            self._disk.set(key, value, expire=self.ttl_s)
+
+    def _put_mem(self, key: str, value: str) -> None:
+        self._mem[key] = value
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._mem), "disk": self._disk is not None}
+
+
+_default_cache: Optional[LLMCache] = None
+_default_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[LLMCache]:
+    """Process-wide cache shared by all GroqClient instances (None if LLM_CACHE=0)."""
+    global _default_cache
+    if os.getenv("LLM_CACHE", "1") == "0":
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache(directory=os.getenv("LLM_CACHE_DIR", DEFAULT_CACHE_DIR))
+        return _default_cache
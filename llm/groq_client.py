@@ -3,14 +3,18 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 import requests
 
+from llm.cache import LLMCache, get_default_cache
 from utils.retry import with_retry, RetryableError
 
 GROQ_BASE_URL = "https://api.groq.com/openai/v1"
 
+# Responses at or below this temperature are treated as deterministic and cached.
+CACHE_MAX_TEMPERATURE = 0.2
+
 @dataclass(frozen=True)
 class LLMResponse:
     content: str
@@ -24,28 +28,83 @@ class GroqClient:
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         timeout_s: float = 30.0,
+        cache: Optional[LLMCache] = None,
     ) -> None:
         self.api_key = api_key or os.getenv("GROQ_API_KEY")
         self.model = model or os.getenv("GROQ_MODEL", "meta-llama/llama-4-scout-17b-16e-instruct")
         self.timeout_s = timeout_s
+        self.cache = cache or get_default_cache()
 
         if not self.api_key:
             raise ValueError(
                 "GROQ_API_KEY is not set. Add it to your environment or .env file."
             )
 
-    @with_retry(attempts=4)
+        # Keep-alive session: reuses the TLS connection across planner/executor/verifier calls.
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+
     def chat(
         self,
         messages: List[Dict[str, str]],
         temperature: float = 0.1,
         max_tokens: int = 1200,
         json_mode: bool = False,
+        stream: bool = False,
+        on_token: Optional[Callable[[str], None]] = None,
+        stop_when: Optional[Callable[[str], bool]] = None,
+        cache_if: Optional[Callable[[str], bool]] = None,
+    ) -> LLMResponse:
+        """Send a chat completion.
+
+        With stream=True the response is read as SSE: each content delta is passed
+        to on_token, and the stream is closed early once stop_when(accumulated)
+        returns True (e.g. the text already parses as a complete JSON document).
+
+        Deterministic, non-streamed calls that pass cache_if use the response cache;
+        a response is stored only when cache_if(content) accepts it, so output the
+        caller would reject (and retry) is never replayed.
+        """
+        if (
+            self.cache is None
+            or cache_if is None
+            or stream
+            or temperature > CACHE_MAX_TEMPERATURE
+        ):
+            return self._chat(messages, temperature, max_tokens, json_mode, stream, on_token, stop_when)
+
+        key = LLMCache.make_key(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            json_mode=json_mode,
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return LLMResponse(content=cached, raw={})
+
+        resp = self._chat(messages, temperature, max_tokens, json_mode)
+        if cache_if(resp.content):
+            self.cache.set(key, resp.content)
+        return resp
+
+    @with_retry(attempts=4)
+    def _chat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        json_mode: bool,
+        stream: bool = False,
+        on_token: Optional[Callable[[str], None]] = None,
+        stop_when: Optional[Callable[[str], bool]] = None,
     ) -> LLMResponse:
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
         payload: Dict[str, Any] = {
             "model": self.model,
             "messages": messages,
@@ -53,46 +112,116 @@ class GroqClient:
             "max_tokens": max_tokens,
         }
 
-       
         if json_mode:
             payload["response_format"] = {"type": "json_object"}
+        if stream:
+            payload["stream"] = True
 
         try:
-            r = requests.post(
+            r = self._session.post(
                 f"{GROQ_BASE_URL}/chat/completions",
-                headers=headers,
                 json=payload,
                 timeout=self.timeout_s,
+                stream=stream,
             )
         except requests.RequestException as e:
             raise RetryableError(f"Groq request failed: {e}") from e
 
         if r.status_code in (429, 500, 502, 503, 504):
-            raise RetryableError(f"Groq transient error {r.status_code}: {r.text[:200]}")
+            raise RetryableError(f"Groq transient error {r.status_code}: {r.content[:200].decode('utf-8', 'replace')}")
 
         if not r.ok:
             raise RuntimeError(f"Groq error {r.status_code}: {r.text}")
 
+        if stream:
+            return self._read_stream(r, on_token, stop_when)
+
         data = r.json()
         content = data["choices"][0]["message"]["content"]
         return LLMResponse(content=content, raw=data)
 
+    def _read_stream(
+        self,
+        r: requests.Response,
+        on_token: Optional[Callable[[str], None]],
+        stop_when: Optional[Callable[[str], bool]],
+    ) -> LLMResponse:
+        parts: List[str] = []
+        stopped_early = False
+        try:
+            with r:
+                # SSE is always UTF-8; requests would fall back to ISO-8859-1 for
+                # text/event-stream without a charset, so decode each line ourselves.
+                for raw_line in r.iter_lines():
+                    if not raw_line.startswith(b"data: "):
+                        continue
+                    chunk = raw_line[len(b"data: "):].decode("utf-8")
+                    if chunk == "[DONE]":
+                        break
+                    choices = json.loads(chunk).get("choices") or [{}]
+                    delta = (choices[0].get("delta") or {}).get("content")
+                    if not delta:
+                        continue
+                    parts.append(delta)
+                    if on_token:
+                        on_token(delta)
+                    # Only re-check on a closing brace; that's the only token that can complete JSON.
+                    if stop_when and "}" in delta and stop_when("".join(parts)):
+                        stopped_early = True
+                        break
+        except requests.RequestException as e:
+            if on_token and parts:
+                # Retrying would replay tokens the caller has already received.
+                raise RuntimeError(f"Groq stream failed after partial output: {e}") from e
+            raise RetryableError(f"Groq stream failed: {e}") from e
+
+        return LLMResponse(content="".join(parts), raw={"stream": True, "stopped_early": stopped_early})
+
+def _balanced_end(text: str, start: int) -> int:
+    """Index just past the bracket matching text[start], or -1 if unbalanced.
+
+    Single forward pass that tracks nesting depth and skips string literals.
+    """
+    depth = 0
+    in_str = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_str:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_str = False
+        elif ch == '"':
+            in_str = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
 def safe_json_loads(text: str) -> Any:
     """Parse JSON robustly; raises ValueError if impossible."""
     text = text.strip()
 
-    
     try:
         return json.loads(text)
     except Exception:
         pass
 
-    
-    import re
-
-    match = re.search(r"(\{.*\}|\[.*\])", text, flags=re.DOTALL)
-    if match:
-        candidate = match.group(1)
-        return json.loads(candidate)
+    # Fall back to the first balanced {...} / [...] block embedded in the text.
+    start = next((i for i, ch in enumerate(text) if ch in "{["), -1)
+    while start != -1:
+        end = _balanced_end(text, start)
+        if end == -1:
+            break
+        try:
+            return json.loads(text[start:end])
+        except ValueError:
+            start = next((i for i in range(start + 1, len(text)) if text[i] in "{["), -1)
 
     raise ValueError("Could not parse JSON from model output.")
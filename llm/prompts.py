@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 
 TOOL_CATALOG = [
     {
@@ -21,6 +22,8 @@ TOOL_CATALOG = [
         "output": {"articles": "list[{title, source, url, published_at}]"},
     },
 ]
+# Serialized once at import; the catalog is static.
+TOOL_CATALOG_JSON = json.dumps(TOOL_CATALOG, ensure_ascii=False, indent=2)
 
 PLANNER_SYSTEM = """You are PlannerAgent, an expert task planner for an AI Operations Assistant.
 You MUST output STRICT JSON only (no markdown, no commentary, no trailing text).
@@ -39,27 +42,67 @@ Rules:
 """
 
 
-PLANNER_USER_TEMPLATE = """User task:
-{task}
+TASK_PLACEHOLDER = "__TASK__"
+
+# User prompts are pre-built at import with the catalog embedded; callers only
+# substitute the task via str.replace (no str.format brace parsing per call).
+PLANNER_USER_PREFIX = f"""User task:
+{TASK_PLACEHOLDER}
 
 Available tools (metadata only):
-{tool_catalog_json}
+{TOOL_CATALOG_JSON}
 
 Return JSON with this schema:
-{{
+""" + """{
   "objective": "string",
   "assumptions": ["string", ...],
   "steps": [
-    {{
+    {
       "id": 1,
       "action": "string",
       "tool_name": "weather_current | github_repo_search | news_search | null",
-      "tool_args": {{}},
+      "tool_args": {},
       "output_key": "string",
       "depends_on": [1,2]
-    }}
+    }
   ]
-}}
+}
+"""
+
+
+PLANNER_VERIFIER_SYSTEM = PLANNER_SYSTEM + """
+In the same response, also emit a verification_spec: the list of output_keys
+whose results are REQUIRED to answer the task (every tool step the answer depends on, plus 'final').
+The spec is checked locally after execution; keep it minimal and exact.
+"""
+
+
+PLANNER_VERIFIER_USER_PREFIX = f"""User task:
+{TASK_PLACEHOLDER}
+
+Available tools (metadata only):
+{TOOL_CATALOG_JSON}
+
+Return JSON with this schema:
+""" + """{
+  "plan": {
+    "objective": "string",
+    "assumptions": ["string", ...],
+    "steps": [
+      {
+        "id": 1,
+        "action": "string",
+        "tool_name": "weather_current | github_repo_search | news_search | null",
+        "tool_args": {},
+        "output_key": "string",
+        "depends_on": [1,2]
+      }
+    ]
+  },
+  "verification_spec": {
+    "required_keys": ["output_key", ..., "final"]
+  }
+}
 """
 
 
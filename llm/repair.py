@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from typing import Any, List, Tuple
+
+import fastjsonschema
+from pydantic import ValidationError
+
+from llm.groq_client import safe_json_loads
+
+_MAX_FRAGMENT_CHARS = 800
+
+Path = Tuple[Any, ...]
+
+
+def _error_paths(err: Exception) -> List[Path]:
+    if isinstance(err, ValidationError):
+        return [tuple(e["loc"]) for e in err.errors()]
+    if isinstance(err, fastjsonschema.JsonSchemaValueException):
+        # e.g. ["data", "steps", "0", "tool_name"]; drop the root name, restore list indices
+        return [tuple(int(p) if p.isdigit() else p for p in err.path[1:])]
+    return []
+
+
+def _fragment(data: Any, path: Path) -> Tuple[Path, Any]:
+    """Deepest existing node along `path` (the offending value or its container)."""
+    node, walked = data, ()
+    for part in path:
+        if isinstance(node, dict) and part in node:
+            node = node[part]
+        elif isinstance(node, list) and isinstance(part, int) and 0 <= part < len(node):
+            node = node[part]
+        else:
+            break
+        walked = (*walked, part)
+    return walked, node
+
+
+def _clip(text: str) -> str:
+    return text if len(text) <= _MAX_FRAGMENT_CHARS else text[:_MAX_FRAGMENT_CHARS] + " ...(truncated)"
+
+
+def build_repair_prompt(err: Exception, last_text: str) -> str:
+    """Repair request with the error and only the offending JSON fragments.
+
+    Falls back to a truncated head of the previous output when it is not JSON at all.
+    """
+    header = (
+        "Your previous output was invalid JSON or did not match the schema. "
+        "Return ONLY the corrected full JSON.\n"
+        f"Error: {_clip(str(err))}\n"
+    )
+
+    try:
+        data = safe_json_loads(last_text)
+    except ValueError:
+        return header + f"Previous output (head):\n{_clip(last_text)}"
+
+    paths = _error_paths(err)
+    if not paths:
+        return header + f"Previous output (head):\n{_clip(last_text)}"
+
+    lines: List[str] = []
+    for path in paths:
+        walked, node = _fragment(data, path)
+        where = "/" + "/".join(str(p) for p in walked)
+        lines.append(f"- at {where}: {_clip(json.dumps(node, ensure_ascii=False))}")
+    return header + "Errors at paths: " + ", ".join("/" + "/".join(map(str, p)) for p in paths) + "\n" + (
+        "Offending fragments:\n" + "\n".join(lines)
+    )
@@ -1,30 +1,25 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Optional
-from dotenv import load_dotenv, find_dotenv
-load_dotenv(find_dotenv())
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-
-from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 import typer
 
-from agents.planner import PlannerAgent
-from agents.executor import ExecutorAgent
-from agents.verifier import VerifierAgent
-from llm.groq_client import GroqClient
 from utils.logging import setup_logging
 
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-load_dotenv(override=True)
-setup_logging()
+    from agents.executor import ExecutorAgent
+    from agents.planner import PlannerAgent
+    from agents.verifier import VerifierAgent
+    from llm.groq_client import GroqClient
 
-app = FastAPI(
-    title="AI Operations Assistant",
-    version="1.0.0",
-    description="Multi-agent AI Ops Assistant .",
-)
+# Heavy imports (fastapi/starlette, agents, HTTP clients, dotenv) are deferred to the
+# code paths that need them so `python main.py --help` starts fast.
+
+setup_logging()
 
 class RunRequest(BaseModel):
     task: str = Field(..., min_length=1)
@@ -38,22 +33,43 @@ class RunResponse(BaseModel):
     final_output: Dict[str, Any]
     logs: list[str]
 
-def _build_agents() -> tuple[PlannerAgent, ExecutorAgent, VerifierAgent]:
+def _make_llm() -> GroqClient:
+    import utils.env  # noqa: F401  (loads .env once per process)
+
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key:
         raise RuntimeError("GROQ_API_KEY is missing. Set it in .env or environment variables.")
 
-    llm = GroqClient(api_key=api_key)
+    from llm.groq_client import GroqClient
+
+    return GroqClient(api_key=api_key)
+
+
+def _build_agents() -> tuple[PlannerAgent, ExecutorAgent, VerifierAgent]:
+    llm = _make_llm()
+
+    from agents.executor import ExecutorAgent
+    from agents.planner import PlannerAgent
+    from agents.verifier import VerifierAgent
+
     return PlannerAgent(llm=llm), ExecutorAgent(llm=llm), VerifierAgent(llm=llm)
 
 
 def run_task(task: str, max_rounds: int = 2) -> RunResponse:
     planner, executor, verifier = _build_agents()
 
-    plan = planner.plan(task)
+    # Establish tool connections (DNS + TLS) while the first planner call waits on the LLM.
+    from tools.registry import warm_tools_in_background
+
+    warm_tools_in_background()
+
+    plan, spec = planner.plan_with_spec(task)
     state = executor.run(task, plan)
 
-    verification = verifier.verify(task, plan, state.results)
+    # Happy path: the planner's spec passes locally and no second LLM call is needed.
+    verification = verifier.check_spec(spec, plan, state.results)
+    if verification is None:
+        verification = verifier.verify(task, plan, state.results)
 
     rounds = 1
     while verification.status == "needs_fix" and verification.fix_steps and rounds < max_rounds:
@@ -70,18 +86,53 @@ def run_task(task: str, max_rounds: int = 2) -> RunResponse:
         logs=state.logs,
     )
 
-@app.get("/health")
-def health() -> Dict[str, str]:
-    return {"status": "ok"}
+_app: Optional[FastAPI] = None
 
-@app.post("/run", response_model=RunResponse)
-def run(req: RunRequest) -> RunResponse:
-    try:
-        return run_task(req.task, max_rounds=req.max_rounds)
-    except RuntimeError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+def _get_app() -> FastAPI:
+    """Build the FastAPI app on first access (uvicorn resolves `main:app` via __getattr__)."""
+    global _app
+    if _app is not None:
+        return _app
+
+    import anyio
+    from fastapi import FastAPI, HTTPException
+
+    from llm.cache import get_default_cache
+
+    import utils.env  # noqa: F401  (loads .env once per process)
+    # Runs are long (LLM + tool I/O) and synchronous; give them their own bounded worker
+    # pool so they cannot starve the default threadpool used by the rest of the app.
+    run_limiter = anyio.CapacityLimiter(int(os.getenv("RUN_CONCURRENCY", "32")))
+    app = FastAPI(
+        title="AI Operations Assistant",
+        version="1.0.0",
+        description="Multi-agent AI Ops Assistant .",
+    )
+
+    @app.get("/health")
+    async def health() -> Dict[str, Any]:
+        cache = get_default_cache()
+        return {"status": "ok", "llm_cache": cache.stats if cache else None}
+
+    @app.post("/run", response_model=RunResponse)
+    async def run(req: RunRequest) -> RunResponse:
+        try:
+            return await anyio.to_thread.run_sync(
+                lambda: run_task(req.task, max_rounds=req.max_rounds),
+                limiter=run_limiter,
+            )
+        except RuntimeError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    _app = app
+    return app
+
+def __getattr__(name: str) -> Any:
+    if name == "app":
+        return _get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ---- CLI ----
@@ -99,10 +150,13 @@ def run_cli(task: str = typer.Argument(..., help="Natural language task to execu
 @cli.command()
 def plan(task: str = typer.Argument(..., help="Task to plan (Planner only)")):
     """Generate and print the Planner JSON plan (no execution)."""
-    api_key = os.getenv("GROQ_API_KEY")
-    if not api_key:
-        raise typer.BadParameter("GROQ_API_KEY is missing. Set it in .env or environment variables.")
-    llm = GroqClient(api_key=api_key)
+    try:
+        llm = _make_llm()
+    except RuntimeError as e:
+        raise typer.BadParameter(str(e))
+
+    from agents.planner import PlannerAgent
+
     planner = PlannerAgent(llm=llm)
     plan_obj = planner.plan(task)
     import json
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from agents.schemas import ToolResult, ToolName
+from utils.env import TOOL_RACE_WORKERS
+
+# Shared pool for provider races; a slow loser finishes here without blocking the caller.
+# Sized for concurrent /run requests (each race holds up to two threads), not one run.
+_RACE_POOL = ThreadPoolExecutor(max_workers=TOOL_RACE_WORKERS, thread_name_prefix="tool-race")
 
 
 class BaseTool(ABC):
@@ -12,3 +18,30 @@ class BaseTool(ABC):
     @abstractmethod
     def call(self, tool_args: Dict[str, Any]) -> ToolResult:
         raise NotImplementedError
+
+    def warm(self) -> None:
+        """Open pooled connections to the tool's hosts ahead of use (best-effort, optional)."""
+        return None
+
+    def _run_provider(self, fn: Callable[..., ToolResult], *args: Any) -> ToolResult:
+        try:
+            return fn(*args)
+        except Exception as e:
+            return ToolResult(ok=False, tool_name=self.name, error=str(e))
+
+    def _race(self, providers: Dict[str, Callable[[], ToolResult]]) -> Tuple[Optional[str], Dict[str, ToolResult]]:
+        """Run providers concurrently and return as soon as one is ok.
+
+        Returns (winner name or None, results of the providers finished so far).
+        """
+        futures: Dict[Future, str] = {_RACE_POOL.submit(self._run_provider, fn): name for name, fn in providers.items()}
+        results: Dict[str, ToolResult] = {}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name = futures[fut]
+                results[name] = fut.result()
+                if results[name].ok:
+                    return name, results
+        return None, results
@@ -6,6 +6,7 @@ import requests
 
 from agents.schemas import ToolResult
 from tools.base import BaseTool
+from utils.http import body_excerpt, new_session
 from utils.retry import with_retry, RetryableError
 
 
@@ -17,25 +18,31 @@ class GitHubTool(BaseTool):
     def __init__(self, timeout_s: float = 20.0) -> None:
         self.timeout_s = timeout_s
         self.base_url = "https://api.github.com"
+        self._session = new_session(
+            {
+                "Accept": "application/vnd.github+json",
+                "User-Agent": "ai-ops-assistant",
+            }
+        )
+
+    def warm(self) -> None:
+        # /rate_limit does not count against the search quota.
+        self._session.head(f"{self.base_url}/rate_limit", timeout=min(self.timeout_s, 3.0))
 
     @with_retry(attempts=3)
     def _get(self, path: str, params: Dict[str, Any]) -> requests.Response:
         url = f"{self.base_url}{path}"
-        headers = {
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "ai-ops-assistant",
-        }
         try:
-            r = requests.get(url, params=params, headers=headers, timeout=self.timeout_s)
+            r = self._session.get(url, params=params, timeout=self.timeout_s)
         except requests.RequestException as e:
             raise RetryableError(f"GitHub request failed: {e}") from e
 
         if r.status_code in (429, 500, 502, 503, 504):
-            raise RetryableError(f"GitHub transient error {r.status_code}: {r.text[:200]}")
+            raise RetryableError(f"GitHub transient error {r.status_code}: {body_excerpt(r)}")
 
         # GitHub rate limit returns 403 with message
-        if r.status_code == 403 and "rate limit" in r.text.lower():
-            raise RetryableError(f"GitHub rate limited: {r.text[:200]}")
+        if r.status_code == 403 and b"rate limit" in r.content.lower():
+            raise RetryableError(f"GitHub rate limited: {body_excerpt(r)}")
 
         return r
 
@@ -63,7 +70,7 @@ class GitHubTool(BaseTool):
             return ToolResult(
                 ok=False,
                 tool_name=self.name,
-                error=f"GitHub error {r.status_code}: {r.text[:200]}",
+                error=f"GitHub error {r.status_code}: {body_excerpt(r)}",
                 meta={"status_code": r.status_code},
             )
 
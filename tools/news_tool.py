@@ -1,30 +1,63 @@
 from __future__ import annotations
 
-import os
-import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Tuple
-from dotenv import load_dotenv, find_dotenv
+import orjson
 import requests
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+
+try:  # libxml2-backed parser; API-compatible with ElementTree for what we use
+    from lxml import etree as ET
+except ImportError:  # pragma: no cover - depends on environment
+    import xml.etree.ElementTree as ET
 
 from agents.schemas import ToolResult
 from tools.base import BaseTool
-from utils.retry import RetryableError, with_retry
-from dotenv import load_dotenv
-load_dotenv()  
+from utils.cache import cache_ok_results
+from utils.env import NEWSAPI_KEY
+from utils.http import TRANSIENT_STATUSES, body_excerpt, lazy_session
+from utils.retry import RetryableError
+
+_DEFAULT_HEADERS = {
+    "User-Agent": "ai_ops_assistant/1.0",
+    "Accept": "application/json, text/plain;q=0.9, */*;q=0.8",
+}
+
+# Defaults live on the session; per-call headers are merged by requests only when given.
+# The RSS feed is streamed into iterparse, so it must not go through the HTTP cache.
+_session = lazy_session(_DEFAULT_HEADERS, http_cache=True, uncached_urls=("news.google.com/rss",), retries=3)
+
+# Per-provider field extractors (one C call per article); fall back to .get() when
+# an item lacks a key.
+_NEWSAPI_FIELDS = itemgetter("title", "source", "url", "publishedAt")
+_GDELT_FIELDS = itemgetter("title", "url", "seendate")
+
+@dataclass(frozen=True)
+class Article:
+    """One normalized article. Slotted (no per-instance dict) since providers build
+    up to pageSize of them per call; pydantic serializes it to a plain dict."""
+
+    __slots__ = ("title", "source", "url", "published_at")  # dataclass(slots=True) needs 3.10
+
+    title: Optional[str]
+    source: Optional[str]
+    url: Optional[str]
+    published_at: Optional[str]
 
 
 class NewsTool(BaseTool):
     """News search tool.
 
-    Priority order:
-      1) NewsAPI.org (if NEWSAPI_KEY is set)
-      2) GDELT 2.1 Doc API
-      3) Google News RSS (no key; best-effort fallback)
+    Provider order:
+      1) NewsAPI.org (if NEWSAPI_KEY is set), tried alone first
+      2) Otherwise, or if it fails: GDELT 2.1 Doc API and Google News RSS (no key)
+         are queried concurrently and the first ok result wins; neither is preferred
 
     Design goals:
       - Never crash on non-JSON responses (safe parsing).
       - Provide useful error/meta details for debugging.
-      - Retry transient failures (429/5xx) and empty bodies.
+      - Retry transient failures (429/5xx) in the session; fail over on empty bodies.
     """
 
     name = "news_search"
@@ -32,13 +65,11 @@ class NewsTool(BaseTool):
     
 
     def __init__(self, timeout_s: float = 25.0) -> None:
-        load_dotenv(find_dotenv())
         self.timeout_s = timeout_s
-        self.newsapi_key = os.getenv("NEWSAPI_KEY") or ""
+        self.newsapi_key = NEWSAPI_KEY
 
     
 
-    @with_retry(attempts=3)
     def _get(
         self,
         url: str,
@@ -46,35 +77,34 @@ class NewsTool(BaseTool):
         headers: Optional[Dict[str, str]] = None,
         *,
         require_body: bool = True,
+        stream: bool = False,
     ) -> requests.Response:
-        default_headers = {
-            "User-Agent": "ai_ops_assistant/1.0",
-            "Accept": "application/json, text/plain;q=0.9, */*;q=0.8",
-        }
-        merged_headers = {**default_headers, **(headers or {})}
-
         try:
-            r = requests.get(url, params=params, headers=merged_headers, timeout=self.timeout_s)
+            r = _session().get(url, params=params, headers=headers, timeout=self.timeout_s, stream=stream)
         except requests.RequestException as e:
             raise RetryableError(f"News request failed: {e}") from e
 
-        # Retry transient/rate-limit errors
-        if r.status_code in (429, 500, 502, 503, 504):
-            raise RetryableError(f"News transient error {r.status_code}: {(r.text or '')[:200]}")
+        # Still transient after the session's retries
+        if r.status_code in TRANSIENT_STATUSES:
+            raise RetryableError(f"News transient error {r.status_code}: {body_excerpt(r)}")
 
-        # Some upstream/proxies return 200 with empty body; retry
-        if require_body and not (r.text or "").strip():
+        # Some upstream/proxies return 200 with empty body
+        if require_body and not r.content.strip():
             raise RetryableError("News provider returned an empty response body")
 
         return r
 
+    def warm(self) -> None:
+        host = "https://newsapi.org" if self.newsapi_key else "https://api.gdeltproject.org"
+        _session().head(host, timeout=min(self.timeout_s, 3.0))
+
     def _safe_json(self, r: requests.Response) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """Return (data, error_message). Never raises JSONDecodeError."""
         try:
-            return r.json(), None
-        except ValueError:
+            return orjson.loads(r.content), None
+        except orjson.JSONDecodeError:
             ct = r.headers.get("Content-Type", "")
-            body_head = (r.text or "").strip()[:300]
+            body_head = body_excerpt(r, 300).strip()
             return None, f"status={r.status_code}, content_type={ct}, body_head={body_head!r}"
 
     # ---------------------------
@@ -100,7 +130,7 @@ class NewsTool(BaseTool):
             return ToolResult(
                 ok=False,
                 tool_name=self.name,
-                error=f"NewsAPI error {r.status_code}: {(r.text or '')[:200]}",
+                error=f"NewsAPI error {r.status_code}: {body_excerpt(r)}",
                 meta={
                     "provider": "newsapi",
                     "status_code": r.status_code,
@@ -140,16 +170,14 @@ class NewsTool(BaseTool):
             )
 
         articles_in = (data or {}).get("articles") or []
-        articles: List[Dict[str, Any]] = []
+        articles: List[Article] = []
         for a in articles_in[:top_n]:
-            source = (a.get("source") or {}).get("name")
+            try:
+                title, source, link, published_at = _NEWSAPI_FIELDS(a)
+            except KeyError:
+                title, source, link, published_at = a.get("title"), a.get("source"), a.get("url"), a.get("publishedAt")
             articles.append(
-                {
-                    "title": a.get("title"),
-                    "source": source,
-                    "url": a.get("url"),
-                    "published_at": a.get("publishedAt"),
-                }
+                Article(title=title, source=(source or {}).get("name"), url=link, published_at=published_at)
             )
 
         return ToolResult(
@@ -178,7 +206,7 @@ class NewsTool(BaseTool):
             return ToolResult(
                 ok=False,
                 tool_name=self.name,
-                error=f"GDELT error {r.status_code}: {(r.text or '')[:200]}",
+                error=f"GDELT error {r.status_code}: {body_excerpt(r)}",
                 meta={
                     "provider": "gdelt",
                     "status_code": r.status_code,
@@ -191,7 +219,7 @@ class NewsTool(BaseTool):
         if parse_err:
             hint = ""
             # common: short queries like "AI" can trigger plain text errors
-            if len(query) < 3 or "too short" in (r.text or "").lower():
+            if len(query) < 3 or b"too short" in r.content.lower():
                 hint = " Hint: try a longer query like 'artificial intelligence' or 'generative ai'."
             return ToolResult(
                 ok=False,
@@ -206,15 +234,19 @@ class NewsTool(BaseTool):
             )
 
         articles_in = (data or {}).get("articles") or []
-        articles: List[Dict[str, Any]] = []
+        articles: List[Article] = []
         for a in articles_in[:top_n]:
+            try:
+                title, link, seendate = _GDELT_FIELDS(a)
+            except KeyError:
+                title, link, seendate = a.get("title"), a.get("url"), a.get("seendate")
             articles.append(
-                {
-                    "title": a.get("title"),
-                    "source": a.get("sourceCountry") or a.get("source") or a.get("domain"),
-                    "url": a.get("url"),
-                    "published_at": a.get("seendate") or a.get("published") or a.get("datetime"),
-                }
+                Article(
+                    title=title,
+                    source=a.get("sourceCountry") or a.get("source") or a.get("domain"),
+                    url=link,
+                    published_at=seendate or a.get("published") or a.get("datetime"),
+                )
             )
 
         return ToolResult(
@@ -236,7 +268,8 @@ class NewsTool(BaseTool):
         headers = {"Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8"}
 
         try:
-            r = self._get(url, params=params, headers=headers)
+            # Streamed: the body is fed to iterparse as it arrives (see below).
+            r = self._get(url, params=params, headers=headers, require_body=False, stream=True)
         except Exception as e:
             return ToolResult(ok=False, tool_name=self.name, error=str(e), meta={"provider": "googlenews_rss"})
 
@@ -244,7 +277,7 @@ class NewsTool(BaseTool):
             return ToolResult(
                 ok=False,
                 tool_name=self.name,
-                error=f"Google News RSS error {r.status_code}: {(r.text or '')[:200]}",
+                error=f"Google News RSS error {r.status_code}: {body_excerpt(r)}",
                 meta={
                     "provider": "googlenews_rss",
                     "status_code": r.status_code,
@@ -253,9 +286,29 @@ class NewsTool(BaseTool):
                 },
             )
 
+        # Stream <item> end-events straight off the socket and stop once top_n are
+        # collected: no full body or DOM in memory, and closing the response
+        # aborts the rest of the transfer.
+        articles: List[Article] = []
+        r.raw.decode_content = True
         try:
-            root = ET.fromstring(r.text)
-        except ET.ParseError as e:
+            for _event, it in ET.iterparse(r.raw, events=("end",)):
+                if it.tag != "item":
+                    continue
+                title = (it.findtext("title") or "").strip()
+                link = (it.findtext("link") or "").strip()
+                published_at = (it.findtext("pubDate") or "").strip()
+                src = it.find("source")
+                source = (src.text or "").strip() if src is not None and src.text else None
+
+                articles.append(
+                    Article(title=title or None, source=source, url=link or None, published_at=published_at or None)
+                )
+                it.clear()
+                if len(articles) >= top_n:
+                    break
+        except (ET.ParseError, requests.RequestException, Urllib3HTTPError) as e:
+            # Malformed XML, or the stream broke / failed to decompress mid-read.
             return ToolResult(
                 ok=False,
                 tool_name=self.name,
@@ -267,24 +320,8 @@ class NewsTool(BaseTool):
                     "final_url": r.url,
                 },
             )
-
-        items = root.findall(".//item")
-        articles: List[Dict[str, Any]] = []
-        for it in items[:top_n]:
-            title = (it.findtext("title") or "").strip()
-            link = (it.findtext("link") or "").strip()
-            published_at = (it.findtext("pubDate") or "").strip()
-            src = it.find("source")
-            source = (src.text or "").strip() if src is not None and src.text else None
-
-            articles.append(
-                {
-                    "title": title or None,
-                    "source": source,
-                    "url": link or None,
-                    "published_at": published_at or None,
-                }
-            )
+        finally:
+            r.close()
 
         return ToolResult(
             ok=True,
@@ -297,8 +334,10 @@ class NewsTool(BaseTool):
     # Public tool entry
     # ---------------------------
 
+    @cache_ok_results(ttl_s=60)
     def call(self, tool_args: Dict[str, Any]) -> ToolResult:
-        query = str(tool_args.get("query", "")).strip()
+        # Canonical whitespace so equivalent queries share HTTP cache entries.
+        query = " ".join(str(tool_args.get("query", "")).split())
         top_n = int(tool_args.get("top_n", 5))
 
         if not query:
@@ -307,41 +346,30 @@ class NewsTool(BaseTool):
         top_n = max(1, min(top_n, 20))
 
         # 1) Primary: NewsAPI (if key exists)
+        newsapi_error: Optional[str] = None
         if self.newsapi_key:
             res = self._newsapi_search(query, top_n)
             if res.ok:
                 return res
-
-            # 2) Fallback: GDELT
-            gd = self._gdelt_search(query, top_n)
-            if gd.ok:
-                gd.meta["fallback_from"] = "newsapi"
-                gd.meta["newsapi_error"] = res.error
-                return gd
-
-            # 3) Last fallback: Google News RSS
-            rss = self._googlenews_rss_search(query, top_n)
-            if rss.ok:
-                rss.meta["fallback_from"] = "gdelt"
-                rss.meta["newsapi_error"] = res.error
-                rss.meta["gdelt_error"] = gd.error
-                return rss
-
-            # Return the most informative failure (rss has good context too)
-            rss.meta["newsapi_error"] = res.error
-            rss.meta["gdelt_error"] = gd.error
-            return rss
-
-        # No NewsAPI key: start at GDELT, then RSS
-        gd = self._gdelt_search(query, top_n)
-        if gd.ok:
-            return gd
-
-        rss = self._googlenews_rss_search(query, top_n)
-        if rss.ok:
-            rss.meta["fallback_from"] = "gdelt"
-            rss.meta["gdelt_error"] = gd.error
-            return rss
-
-        rss.meta["gdelt_error"] = gd.error
-        return rss
+            newsapi_error = res.error
+
+        # 2) Fallbacks: race GDELT and Google News RSS, first ok result wins
+        winner, results = self._race(
+            {
+                "gdelt": lambda: self._gdelt_search(query, top_n),
+                "googlenews_rss": lambda: self._googlenews_rss_search(query, top_n),
+            }
+        )
+        gd = results.get("gdelt")
+        out = results[winner] if winner else results["googlenews_rss"]
+
+        if newsapi_error is not None:
+            out.meta["newsapi_error"] = newsapi_error
+            if winner:
+                out.meta["fallback_from"] = "newsapi"
+        if winner != "gdelt" and gd is not None:
+            # RSS answered (or everything failed) after GDELT had already failed
+            if winner:
+                out.meta["fallback_from"] = "gdelt"
+            out.meta["gdelt_error"] = gd.error
+        return out
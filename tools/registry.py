@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import Dict
+import threading
+from typing import Callable, Dict, Tuple
 
 from tools.github_tool import GitHubTool
 from tools.weather_tool import WeatherTool
@@ -8,13 +9,51 @@ from tools.news_tool import NewsTool
 from tools.base import BaseTool
 
 
-_TOOL_REGISTRY: Dict[str, BaseTool] = {
-    "github_repo_search": GitHubTool(),
-    "weather_current": WeatherTool(),
-    "news_search": NewsTool(),
+# Tools are constructed on first use, so a process only pays for the ones it calls.
+_TOOL_REGISTRY: Dict[str, Callable[[], BaseTool]] = {
+    "github_repo_search": GitHubTool,
+    "weather_current": WeatherTool,
+    "news_search": NewsTool,
 }
 
+TOOL_NAMES: Tuple[str, ...] = tuple(_TOOL_REGISTRY)
+
+_INSTANCES: Dict[str, BaseTool] = {}
+_INSTANCES_LOCK = threading.Lock()
+
 def get_tool(tool_name: str) -> BaseTool:
-    if tool_name not in _TOOL_REGISTRY:
-        raise KeyError(f"Unknown tool: {tool_name}")
-    return _TOOL_REGISTRY[tool_name]
+    tool = _INSTANCES.get(tool_name)
+    if tool is not None:
+        return tool
+    try:
+        factory = _TOOL_REGISTRY[tool_name]
+    except KeyError:
+        raise KeyError(f"Unknown tool: {tool_name}") from None
+    with _INSTANCES_LOCK:  # executor waves may ask for the same tool concurrently
+        tool = _INSTANCES.get(tool_name)
+        if tool is None:
+            tool = _INSTANCES[tool_name] = factory()
+    return tool
+
+def warm_tools() -> None:
+    """Best-effort connection warm-up for every registered tool (instantiating it)."""
+    for name in TOOL_NAMES:
+        try:
+            get_tool(name).warm()
+        except Exception:
+            pass
+
+_warm_started = False
+
+def warm_tools_in_background() -> None:
+    """Start warm_tools() on a daemon thread, once per process; later calls are no-ops.
+
+    Pooled keep-alive connections outlive a single run, so repeating the warm-up
+    per request would only add outbound traffic.
+    """
+    global _warm_started
+    with _INSTANCES_LOCK:
+        if _warm_started:
+            return
+        _warm_started = True
+    threading.Thread(target=warm_tools, name="warm-tools", daemon=True).start()
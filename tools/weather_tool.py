@@ -1,17 +1,49 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime
-from typing import Any, Dict, Optional, Tuple
-from dotenv import load_dotenv, find_dotenv
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Tuple
 
+import orjson
 import requests
 
 from agents.schemas import ToolResult
 from tools.base import BaseTool
-from utils.retry import with_retry, RetryableError
-
-
+from utils.cache import cache_ok_results
+from utils.env import OPENWEATHER_API_KEY
+from utils.http import TRANSIENT_STATUSES, body_excerpt, lazy_session
+from utils.retry import RetryableError
+
+try:  # optional on-disk geocode cache, shared across processes and restarts
+    import diskcache
+except ImportError:  # pragma: no cover - depends on environment
+    diskcache = None
+
+_session = lazy_session(http_cache=True, retries=3)
+
+# (provider, normalized city) -> geocode hit. City coordinates are effectively static.
+_GEO_CACHE_MAX = 512
+_GEO_CACHE: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+_GEO_LOCK = threading.Lock()
+
+GEO_CACHE_DIR = os.path.join(".cache", "geo")
+_GEO_DISK_TTL_S = 30 * 86400
+_geo_disk: Any = None  # diskcache.Cache, opened on first lookup (caller holds _GEO_LOCK)
+_geo_disk_opened = False
+
+
+def _geo_disk_cache() -> Any:
+    global _geo_disk, _geo_disk_opened
+    if not _geo_disk_opened:
+        _geo_disk_opened = True
+        if diskcache is not None:
+            try:
+                _geo_disk = diskcache.Cache(GEO_CACHE_DIR)
+            except OSError:
+                _geo_disk = None
+    return _geo_disk
 
 _OPEN_METEO_CODE_MAP = {
     0: "Clear sky",
@@ -44,58 +76,96 @@ _OPEN_METEO_CODE_MAP = {
     99: "Thunderstorm with heavy hail",
 }
 
+# WMO codes are small ints; index a tuple instead of hashing into the dict.
+_OPEN_METEO_CODE_ARR: Tuple[Optional[str], ...] = tuple(_OPEN_METEO_CODE_MAP.get(i) for i in range(100))
+
 
 class WeatherTool(BaseTool):
     """
     Current weather by city.
 
     Strategy:
-    - If OPENWEATHER_API_KEY is present, try OpenWeather first.
-    - If OpenWeather fails (bad key, rate limit, network, parsing, etc.), fall back to Open-Meteo (no key).
+    - Without OPENWEATHER_API_KEY, query Open-Meteo (no key) only.
+    - With a key, query OpenWeather and Open-Meteo concurrently and return whichever
+      succeeds first; the keyed provider is not preferred, so Open-Meteo wins whenever
+      it answers first. If both fail, the errors are combined.
     - Always returns the same normalized output fields your app expects.
     """
 
     name = "weather_current"
 
     def __init__(self, timeout_s: float = 20.0) -> None:
-        load_dotenv(find_dotenv()) 
         self.timeout_s = timeout_s
-        self.openweather_key = (os.getenv("OPENWEATHER_API_KEY") or "").strip()
+        self.openweather_key = OPENWEATHER_API_KEY
+
+    def warm(self) -> None:
+        hosts = ["https://geocoding-api.open-meteo.com", "https://api.open-meteo.com"]
+        if self.openweather_key:
+            hosts.insert(0, "https://api.openweathermap.org")
+        for host in hosts:
+            _session().head(host, timeout=min(self.timeout_s, 3.0))
 
-    @with_retry(attempts=3)
     def _get(self, url: str, params: Dict[str, Any]) -> requests.Response:
         try:
-            r = requests.get(url, params=params, timeout=self.timeout_s)
+            r = _session().get(url, params=params, timeout=self.timeout_s)
         except requests.RequestException as e:
             raise RetryableError(f"HTTP request failed: {e}") from e
 
-        # Retry transient errors
-        if r.status_code in (429, 500, 502, 503, 504):
-            raise RetryableError(f"Transient HTTP {r.status_code}: {r.text[:200]}")
+        # Still transient after the session's retries
+        if r.status_code in TRANSIENT_STATUSES:
+            raise RetryableError(f"Transient HTTP {r.status_code}: {body_excerpt(r)}")
 
         return r
 
-    
+    def _geocode(
+        self,
+        provider: str,
+        city: str,
+        fetch: Callable[[str], Optional[Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        """Memoized geocode lookup (memory, then disk); only successful hits are cached."""
+        key = (provider, city.strip().lower())
+        with _GEO_LOCK:
+            hit = _GEO_CACHE.get(key)
+            if hit is not None:
+                _GEO_CACHE.move_to_end(key)
+                return hit
+            disk = _geo_disk_cache()
+
+        disk_key = f"{provider}:{key[1]}"
+        geo = disk.get(disk_key) if disk is not None else None
+        if geo is None:
+            geo = fetch(city)
+            if geo and disk is not None:
+                disk.set(disk_key, geo, expire=_GEO_DISK_TTL_S)
+        if geo:
+            with _GEO_LOCK:
+                _GEO_CACHE[key] = geo
+                while len(_GEO_CACHE) > _GEO_CACHE_MAX:
+                    _GEO_CACHE.popitem(last=False)
+        return geo
+
     def _ow_geocode(self, city: str) -> Optional[Dict[str, Any]]:
         url = "https://api.openweathermap.org/geo/1.0/direct"
         params = {"q": city, "limit": 1, "appid": self.openweather_key}
         r = self._get(url, params=params)
         if not r.ok:
             return None
-        data = r.json()
+        data = orjson.loads(r.content)
         if not isinstance(data, list) or not data:
             return None
         return data[0]
 
     def _ow_local_time(self, dt_utc: int, tz_offset_s: int) -> str:
-        local_dt = datetime.utcfromtimestamp(dt_utc + tz_offset_s)
-        return local_dt.strftime("%Y-%m-%dT%H:%M")
+        # Shift by the city's offset, then read the wall-clock fields off a UTC datetime.
+        local = datetime.fromtimestamp(dt_utc + tz_offset_s, tz=timezone.utc)
+        return f"{local.year:04d}-{local.month:02d}-{local.day:02d}T{local.hour:02d}:{local.minute:02d}"
 
     def _openweather_current(self, city: str) -> ToolResult:
         if not self.openweather_key:
             return ToolResult(ok=False, tool_name=self.name, error="OPENWEATHER_API_KEY not set", meta={"provider": "openweather"})
 
-        geo = self._ow_geocode(city)
+        geo = self._geocode("openweather", city, self._ow_geocode)
         if not geo:
             return ToolResult(ok=False, tool_name=self.name, error=f"OpenWeather geocode failed for: {city}", meta={"provider": "openweather"})
 
@@ -114,11 +184,11 @@ class WeatherTool(BaseTool):
             return ToolResult(
                 ok=False,
                 tool_name=self.name,
-                error=f"OpenWeather error {r.status_code}: {r.text[:200]}",
+                error=f"OpenWeather error {r.status_code}: {body_excerpt(r)}",
                 meta={"provider": "openweather", "status_code": r.status_code},
             )
 
-        j = r.json()
+        j = orjson.loads(r.content)
         main = j.get("main") or {}
         wind = j.get("wind") or {}
         weather_arr = j.get("weather") or []
@@ -160,14 +230,14 @@ class WeatherTool(BaseTool):
         r = self._get(url, params=params)
         if not r.ok:
             return None
-        j = r.json()
+        j = orjson.loads(r.content)
         results = j.get("results") or []
         if not results:
             return None
         return results[0]
 
     def _open_meteo_current(self, city: str) -> ToolResult:
-        geo = self._om_geocode(city)
+        geo = self._geocode("open-meteo", city, self._om_geocode)
         if not geo:
             return ToolResult(ok=False, tool_name=self.name, error=f"Open-Meteo geocode failed for: {city}", meta={"provider": "open-meteo"})
 
@@ -189,11 +259,11 @@ class WeatherTool(BaseTool):
             return ToolResult(
                 ok=False,
                 tool_name=self.name,
-                error=f"Open-Meteo error {r.status_code}: {r.text[:200]}",
+                error=f"Open-Meteo error {r.status_code}: {body_excerpt(r)}",
                 meta={"provider": "open-meteo", "status_code": r.status_code},
             )
 
-        j = r.json()
+        j = orjson.loads(r.content)
         cur = j.get("current") or {}
 
         temp_c = cur.get("temperature_2m")
@@ -201,7 +271,9 @@ class WeatherTool(BaseTool):
         humidity = cur.get("relative_humidity_2m")
         wind_kph = cur.get("wind_speed_10m")
         code = cur.get("weather_code")
-        conditions = _OPEN_METEO_CODE_MAP.get(code, f"Weather code {code}" if code is not None else None)
+        conditions = _OPEN_METEO_CODE_ARR[code] if isinstance(code, int) and 0 <= code < 100 else None
+        if conditions is None and code is not None:
+            conditions = f"Weather code {code}"
         observed_at = cur.get("time")
 
         out = {
@@ -221,31 +293,42 @@ class WeatherTool(BaseTool):
         return ToolResult(ok=True, tool_name=self.name, data=out, meta={"provider": "open-meteo", "status_code": r.status_code})
 
     
+    @cache_ok_results(ttl_s=600)
     def call(self, tool_args: Dict[str, Any]) -> ToolResult:
         city = str(tool_args.get("city", "")).strip()
         if not city:
             return ToolResult(ok=False, tool_name=self.name, error="Missing 'city'")
 
-        ow_error: Optional[str] = None
-
-        # Try OpenWeather first (only if key exists)
-        if self.openweather_key:
-            ow_res = self._openweather_current(city)
-            if ow_res.ok:
-                return ow_res
-            ow_error = ow_res.error or "OpenWeather failed"
-
-        # Fall back to Open-Meteo (no key)
-        om_res = self._open_meteo_current(city)
-        if om_res.ok:
-            # annotate that we fell back
-            meta = dict(om_res.meta or {})
-            if ow_error:
+        if not self.openweather_key:
+            om_res = self._run_provider(self._open_meteo_current, city)
+            if om_res.ok:
+                return om_res
+            return self._combined_error(None, om_res)
+
+        # Race OpenWeather and Open-Meteo; the first ok result wins, so a failing
+        # primary no longer adds a full serial round-trip before the fallback.
+        winner, results = self._race(
+            {
+                "openweather": lambda: self._openweather_current(city),
+                "open-meteo": lambda: self._open_meteo_current(city),
+            }
+        )
+        ow_res = results.get("openweather")
+        if winner == "openweather":
+            return ow_res
+        if winner == "open-meteo":
+            om_res = results["open-meteo"]
+            if ow_res is not None:
+                # annotate that we fell back
+                meta = dict(om_res.meta or {})
                 meta["fallback_from"] = "openweather"
-                meta["openweather_error"] = ow_error
-            om_res.meta = meta
+                meta["openweather_error"] = ow_res.error or "OpenWeather failed"
+                om_res.meta = meta
             return om_res
 
+        return self._combined_error(ow_res.error or "OpenWeather failed", results["open-meteo"])
+
+    def _combined_error(self, ow_error: Optional[str], om_res: ToolResult) -> ToolResult:
         # If both fail, return a combined error
         combined = "Weather lookup failed."
         details = []
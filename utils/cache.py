@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+import orjson
+
+V = TypeVar("V")
+
+
+def canonical_args(args: Dict[str, Any]) -> str:
+    """Stable key text for tool args (sorted keys).
+
+    orjson covers the common case; values it rejects (e.g. ints beyond 64 bits)
+    fall back to the stdlib encoder instead of failing the call.
+    """
+    try:
+        return orjson.dumps(args, option=orjson.OPT_SORT_KEYS).decode()
+    except TypeError:
+        return json.dumps(args, sort_keys=True, default=str)
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe LRU with a per-entry time-to-live."""
+
+    def __init__(self, maxsize: int, ttl_s: float) -> None:
+        self.maxsize = maxsize
+        self.ttl_s = ttl_s
+        self._data: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_s, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+def cache_ok_results(ttl_s: float, maxsize: int = 256) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Cache a tool's `call(tool_args)` by (tool name, canonical args); only ok results are kept."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        cache: TTLCache[Any] = TTLCache(maxsize=maxsize, ttl_s=ttl_s)
+
+        @functools.wraps(fn)
+        def wrapper(self: Any, tool_args: Dict[str, Any]) -> Any:
+            key = (self.name, canonical_args(tool_args))
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+            res = fn(self, tool_args)
+            if res.ok:
+                cache.set(key, res)
+            return res
+
+        wrapper.cache = cache  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
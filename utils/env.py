@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import os
+
+from dotenv import find_dotenv, load_dotenv
+
+# find_dotenv() walks up the filesystem; do it once per process, at first import,
+# instead of in every tool constructor or entry point. .env values win over the
+# inherited environment.
+load_dotenv(find_dotenv(), override=True)
+
+# Provider keys, read once; tools take them as defaults.
+NEWSAPI_KEY: str = os.getenv("NEWSAPI_KEY") or ""
+OPENWEATHER_API_KEY: str = (os.getenv("OPENWEATHER_API_KEY") or "").strip()
+
+# On-disk HTTP response cache for weather/news providers (see utils.http); 0 disables.
+HTTP_CACHE: bool = os.getenv("HTTP_CACHE", "1") != "0"
+
+# Threads shared by all tools' provider races (see tools.base); created on demand.
+TOOL_RACE_WORKERS: int = int(os.getenv("TOOL_RACE_WORKERS", "32"))
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from utils.env import HTTP_CACHE
+
+HTTP_CACHE_NAME = os.path.join(".cache", "http")
+
+# Query params / headers carrying API keys (OpenWeather, NewsAPI).
+_CREDENTIAL_PARAMS = ("appid", "apiKey", "X-Api-Key")
+
+TRANSIENT_STATUSES = (429, 500, 502, 503, 504)
+_MAX_RETRY_AFTER_S = 3.0
+
+
+class _CappedRetry(Retry):
+    """Honours Retry-After, but never sleeps longer than a tool call can afford."""
+
+    def get_retry_after(self, response):  # type: ignore[no-untyped-def]
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, _MAX_RETRY_AFTER_S)
+
+
+def _transport_retry(total: int) -> Retry:
+    # raise_on_status=False: once retries are spent the last response is returned
+    # and the caller's status handling produces the error message.
+    return _CappedRetry(
+        total=total,
+        backoff_factor=0.5,
+        status_forcelist=TRANSIENT_STATUSES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _requests_cache() -> Any:
+    try:  # optional HTTP cache with ETag/Last-Modified revalidation; imported on first use
+        import requests_cache
+    except ImportError:  # pragma: no cover - depends on environment
+        return None
+    return requests_cache
+
+
+def new_session(
+    headers: Optional[Mapping[str, str]] = None,
+    *,
+    http_cache: bool = False,
+    uncached_urls: Sequence[str] = (),
+    retries: int = 0,
+) -> requests.Session:
+    """Keep-alive session with a pooled adapter; tools keep one per module.
+
+    `retries` > 0 retries connection errors and transient statuses (429/5xx) inside
+    the adapter, with exponential backoff and Retry-After support.
+
+    With `http_cache=True` (and requests-cache installed, HTTP_CACHE not 0) GETs go
+    through an on-disk cache that honours upstream Cache-Control/ETag headers and
+    serves a stale copy if the provider errors. URL patterns in `uncached_urls` bypass
+    it entirely (requests-cache reads the whole body to store it, which breaks
+    streamed consumers of `r.raw`).
+    """
+    requests_cache = _requests_cache() if (http_cache and HTTP_CACHE) else None
+    if requests_cache is not None:
+        session: requests.Session = requests_cache.CachedSession(
+            cache_name=HTTP_CACHE_NAME,
+            backend="sqlite",
+            expire_after=60,
+            urls_expire_after={url: requests_cache.DO_NOT_CACHE for url in uncached_urls},
+            # Keep provider credentials out of cache keys and the stored requests on disk.
+            ignored_parameters=_CREDENTIAL_PARAMS,
+            cache_control=True,
+            stale_if_error=True,
+            allowable_methods=("GET",),  # warm-up HEADs must reach the network
+        )
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=_transport_retry(retries) if retries else 0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def lazy_session(
+    headers: Optional[Mapping[str, str]] = None,
+    *,
+    http_cache: bool = False,
+    uncached_urls: Sequence[str] = (),
+    retries: int = 0,
+) -> Callable[[], requests.Session]:
+    """Getter for a module-level session built on first use, so importing a tool
+    opens no HTTP cache file and imports no cache backend."""
+    session: Optional[requests.Session] = None
+    lock = threading.Lock()
+
+    def get() -> requests.Session:
+        nonlocal session
+        if session is None:
+            with lock:
+                if session is None:
+                    session = new_session(headers, http_cache=http_cache, uncached_urls=uncached_urls, retries=retries)
+        return session
+
+    return get
+
+
+def body_excerpt(r: requests.Response, limit: int = 200) -> str:
+    """Head of the response body for error messages, without decoding the rest of it."""
+    return r.content[:limit].decode("utf-8", "replace")
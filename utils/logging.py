@@ -2,18 +2,29 @@ from __future__ import annotations
 
 import logging
 import os
+import sys
 from typing import Optional
 
-from rich.logging import RichHandler
-
 def setup_logging(level: Optional[str] = None) -> None:
-    """Configure app-wide logging with nice console output."""
+    """Configure app-wide logging.
+
+    Plain stderr output by default; rich console output (imported lazily) with
+    LOG_RICH=1, or when debugging on an interactive terminal.
+    """
     log_level = (level or os.getenv("LOG_LEVEL", "INFO")).upper()
+    if os.getenv("LOG_RICH", "0") == "1" or (log_level == "DEBUG" and sys.stderr.isatty()):
+        from rich.logging import RichHandler
+
+        handler: logging.Handler = RichHandler(rich_tracebacks=True)
+        fmt = "%(message)s"
+    else:
+        handler = logging.StreamHandler()
+        fmt = "%(asctime)s %(levelname)s %(name)s: %(message)s"
     logging.basicConfig(
         level=log_level,
-        format="%(message)s",
+        format=fmt,
         datefmt="[%X]",
-        handlers=[RichHandler(rich_tracebacks=True)],
+        handlers=[handler],
     )
 
 def get_logger(name: str) -> logging.Logger:
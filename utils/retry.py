@@ -1,29 +1,37 @@
 from __future__ import annotations
 
+import functools
+import random
+import time
 from typing import Callable, TypeVar, Any, Optional
 
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential_jitter,
-)
-
 T = TypeVar("T")
 
 class RetryableError(RuntimeError):
     """Raised for transient errors where retrying is appropriate."""
 
+@functools.lru_cache(maxsize=32)
 def with_retry(
     attempts: int = 3,
     min_seconds: float = 0.5,
     max_seconds: float = 6.0,
     retry_exceptions: tuple[type[BaseException], ...] = (RetryableError,),
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
-    """Decorator factory for exponential backoff + jitter retries."""
-    return retry(
-        reraise=True,
-        stop=stop_after_attempt(attempts),
-        wait=wait_exponential_jitter(initial=min_seconds, max=max_seconds),
-        retry=retry_if_exception_type(retry_exceptions),
-    )
+    """Decorator factory for exponential backoff + jitter retries.
+
+    Memoized per configuration; the last exception is re-raised once attempts run out.
+    """
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            for attempt in range(attempts - 1):
+                try:
+                    return fn(*args, **kwargs)
+                except retry_exceptions:
+                    time.sleep(min(max_seconds, min_seconds * 2**attempt + random.uniform(0, min_seconds)))
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator